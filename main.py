@@ -79,21 +79,27 @@ class ClaudeModelWrapper:
         self.openai_model = "gpt-4o-mini"  # Default OpenAI model
         self.credit_exhausted = False  # Track if Claude credits are exhausted
     
-    def generate_content(self, prompt):
-        """Mimics Gemini's generate_content method with Claude primary, OpenAI fallback"""
+    def generate_content(self, prompt, generation_config=None):
+        """Mimics Gemini's generate_content method with Claude primary, OpenAI fallback
+        generation_config={"response_mime_type": "application/json"} asks for a bare JSON object"""
         # Reset credit_exhausted flag at the start of each request
         self.credit_exhausted = False
+        json_output = bool(generation_config) and generation_config.get("response_mime_type") == "application/json"
         
         # Try Claude first if available
         if self.claude_client:
             try:
+                messages = [
+                    {"role": "user", "content": prompt}
+                ]
+                if json_output:
+                    # Prefill the reply with "{" so Claude answers with the JSON object itself
+                    messages.append({"role": "assistant", "content": "{"})
                 response = self.claude_client.messages.create(
                     model=self.claude_model,
                     max_tokens=4096,
                     temperature=0.7,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
+                    messages=messages
                 )
                 
                 # Create a response object that mimics Gemini's response
@@ -106,7 +112,7 @@ class ClaudeModelWrapper:
                     # Claude returns content as a list of text blocks
                     content = response.content[0].text if hasattr(response.content[0], 'text') else str(response.content[0])
                     if content:
-                        return Response(content)
+                        return Response("{" + content if json_output else content)
                     else:
                         raise Exception("Claude API returned empty content")
                 else:
@@ -135,7 +141,7 @@ class ClaudeModelWrapper:
                     print("Falling back to OpenAI...")
                     self.credit_exhausted = True  # Mark that credits are exhausted
                     if self.openai_client:
-                        return self._use_openai(prompt)
+                        return self._use_openai(prompt, json_output)
                     else:
                         raise Exception(f"Claude API error (insufficient credits) and no OpenAI fallback available: {error_msg}")
                 else:
@@ -143,25 +149,28 @@ class ClaudeModelWrapper:
                     print(f"Claude API Error: {error_msg}")
                     if self.openai_client:
                         print("Falling back to OpenAI...")
-                        return self._use_openai(prompt)
+                        return self._use_openai(prompt, json_output)
                     else:
                         raise Exception(f"Claude API error: {error_msg}")
         
         # If no Claude client, use OpenAI
         if self.openai_client:
-            return self._use_openai(prompt)
+            return self._use_openai(prompt, json_output)
         
         raise Exception("No API client available")
     
-    def _use_openai(self, prompt):
+    def _use_openai(self, prompt, json_output=False):
         """Internal method to use OpenAI API"""
         try:
+            # JSON mode makes OpenAI return a bare JSON object
+            extra_args = {"response_format": {"type": "json_object"}} if json_output else {}
             response = self.openai_client.chat.completions.create(
                 model=self.openai_model,
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.7
+                temperature=0.7,
+                **extra_args
             )
             
             class Response:
@@ -231,7 +240,8 @@ def _process_one_batch_job(
     batch_output_dir: Path,
     template_file: str,
     model,
-    file_prefix: str
+    file_prefix: str,
+    use_cache: bool = True
 ):
     """
     Synchronous per-row job processor (runs in a worker thread via asyncio.to_thread).
@@ -246,7 +256,7 @@ def _process_one_batch_job(
         job_folder.mkdir(exist_ok=True)
 
         # Tailor the resume (Claude API call)
-        _, tailored_resume = tailor_resume(job_description, model, template_file)
+        _, tailored_resume = tailor_resume(job_description, model, template_file, use_cache=use_cache)
 
         # Resume filename based on person's name in template JSON
         person_name = tailored_resume.get('name', 'Resume') if isinstance(tailored_resume, dict) else 'Resume'
@@ -398,6 +408,8 @@ class JobSubmission(BaseModel):
     # When True: generate only a cover letter (no resume PDF)
     # When False: generate both resume PDF and cover letter
     cover_letter_only: Optional[bool] = True
+    # When False: generate a new version even if this job description was tailored before
+    use_cache: Optional[bool] = True
 
 class TailoredResumeResponse(BaseModel):
     # May be omitted when only a cover letter is requested
@@ -411,6 +423,8 @@ class TailoredResumeResponse(BaseModel):
 class GoogleSheetsBatchSubmission(BaseModel):
     google_sheets_links: List[str]
     template: str
+    # When False: generate new versions even for job descriptions tailored before
+    use_cache: Optional[bool] = True
 
 # Authentication functions
 def load_users():
@@ -626,20 +640,21 @@ async def tailor_resume_endpoint(job_data: JobSubmission, current_user: dict = D
         # Normalize template name to match filesystem (case-insensitive)
         template_name_normalized = normalize_template_name(job_data.template)
         template_file = f"resume_templates/{template_name_normalized}"
-        json_path, tailored_resume = tailor_resume(job_data.job_description, model, template_file)
+        json_path, tailored_resume = tailor_resume(job_data.job_description, model, template_file, use_cache=job_data.use_cache is not False)
 
-        # Convert JSON to text format
-        text_path, _ = convert_json_to_text(tailored_resume)
         # Extract template name from the normalized file path for the output filename
         template_name = os.path.splitext(os.path.basename(template_name_normalized))[0] if template_name_normalized else "default"
 
         response: dict = {}
 
-        # Generate resume PDF only when requested
+        # Convert JSON to text format and generate the resume PDF (only when requested)
+        # in worker threads; both only read tailored_resume, so their file writes overlap
+        writers = [asyncio.to_thread(convert_json_to_text, tailored_resume, output_dir=OUTPUT_DIR)]
+        if not cover_letter_only:
+            pdf_path = OUTPUT_DIR / f"{template_name}_resume.pdf"
+            writers.append(asyncio.to_thread(generate_pdf_from_json, tailored_resume, pdf_path))
+        (text_path, _), *_ = await asyncio.gather(*writers)
         if not cover_letter_only:
-            output_dir = Path("output")
-            pdf_path = output_dir / f"{template_name}_resume.pdf"
-            generate_pdf_from_json(tailored_resume, pdf_path)
             response["resume_url"] = f"/download/resume/{pdf_path.name}"
 
         # Generate cover letter (for both modes)
@@ -675,6 +690,8 @@ async def tailor_resume_endpoint(job_data: JobSubmission, current_user: dict = D
 async def tailor_resume_batch_endpoint(
     file: UploadFile = File(...),
     template: str = Form(...),
+    # When False: generate new versions even for job descriptions tailored before
+    use_cache: bool = Form(True),
     current_user: dict = Depends(get_current_user)
 ):
     """Generate multiple tailored resumes based on Excel file with Title and Description columns."""
@@ -812,7 +829,8 @@ async def tailor_resume_batch_endpoint(
                         batch_output_dir=batch_output_dir,
                         template_file=template_file,
                         model=model,
-                        file_prefix=payload["file_prefix"]
+                        file_prefix=payload["file_prefix"],
+                        use_cache=use_cache
                     )
 
             results = await asyncio.gather(*(run_one(p) for p in row_payloads))
@@ -975,7 +993,8 @@ async def tailor_resume_batch_google_sheets_endpoint(
                     batch_output_dir=batch_output_dir,
                     template_file=template_file,
                     model=model,
-                    file_prefix=payload["file_prefix"]
+                    file_prefix=payload["file_prefix"],
+                    use_cache=batch_data.use_cache is not False
                 )
 
         results = await asyncio.gather(*(run_one(p) for p in row_payloads))
@@ -3,242 +3,316 @@ from datetime import datetime
 from pathlib import Path
 import os
 import re
+import string
+import copy
+import functools
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-def fix_repetitive_verbs(resume_data):
+# Job-title domain keywords, matched on word boundaries in a single pass
+# (e.g. "iostream" must not match "ios", "javascript" must not match "java")
+_DOMAIN_RE = re.compile(
+    r'\b(full[\s-]*stack|shopify|ios|android|react|angular|vue|node|python|java|'
+    r'front[\s-]*end|back[\s-]*end|devops|cloud|mobile)\b',
+    re.IGNORECASE
+)
+
+# Canonical domain names keyed by the matched keyword with spaces/hyphens removed
+_DOMAIN_NAMES = {
+    "fullstack": "Full Stack",
+    "shopify": "Shopify",
+    "ios": "iOS",
+    "android": "Android",
+    "react": "React",
+    "angular": "Angular",
+    "vue": "Vue",
+    "node": "Node.js",
+    "python": "Python",
+    "java": "Java",
+    "frontend": "Frontend",
+    "backend": "Backend",
+    "devops": "DevOps",
+    "cloud": "Cloud",
+    "mobile": "Mobile"
+}
+
+# When a title has several domain keywords, the one listed first in _DOMAIN_NAMES wins
+# (e.g. "Java Full Stack Developer" is Full Stack, "Backend Python Engineer" is Python)
+_DOMAIN_PRIORITY = {keyword: priority for priority, keyword in enumerate(_DOMAIN_NAMES)}
+
+# Spaces/hyphens dropped from a matched domain keyword before the _DOMAIN_NAMES lookup
+_DOMAIN_SEPARATOR_RE = re.compile(r'[\s-]')
+
+# Seniority prefixes stripped from job titles to recover the domain
+_LEVEL_PREFIX_RE = re.compile(
+    r'\b(?:Senior|Lead|Principal|Staff|Junior|Mid-level|Mid)\b\s*',
+    re.IGNORECASE
+)
+
+# Senior and mid-level prefixes removed from the oldest (entry-level) job title
+_SENIORITY_PREFIX_RE = re.compile(
+    r'\b(?:Senior|Lead|Principal|Staff|Mid-level|Mid)\b\s*',
+    re.IGNORECASE
+)
+
+# Senior-level markers in a job title
+_SENIOR_RE = re.compile(r'\b(senior|lead|principal|staff)\b', re.IGNORECASE)
+
+# Common action verbs and their alternatives (expanded list)
+_VERB_ALTERNATIVES = {
+    "architected": ["engineered", "designed", "built", "constructed", "developed", "crafted", "established", "pioneered"],
+    "architecting": ["engineering", "designing", "building", "constructing", "developing", "crafting"],
+    "developed": ["architected", "engineered", "built", "designed", "created", "implemented", "delivered", "constructed", "established", "pioneered"],
+    "developing": ["architecting", "engineering", "building", "designing", "creating", "implementing", "delivering"],
+    "optimized": ["enhanced", "streamlined", "improved", "refined", "upgraded", "boosted", "maximized"],
+    "created": ["established", "founded", "built", "designed", "launched", "pioneered", "initiated", "introduced"],
+    "implemented": ["deployed", "integrated", "executed", "established", "introduced", "rolled out", "delivered"],
+    "built": ["architected", "engineered", "constructed", "developed", "designed", "crafted", "assembled"],
+    "designed": ["architected", "crafted", "created", "engineered", "planned", "conceptualized", "modeled"],
+    "led": ["spearheaded", "orchestrated", "managed", "directed", "headed", "guided", "championed"],
+    "managed": ["orchestrated", "supervised", "coordinated", "oversaw", "directed", "administered", "governed"],
+    "improved": ["enhanced", "optimized", "upgraded", "refined", "boosted", "elevated", "advanced"],
+    "increased": ["boosted", "enhanced", "amplified", "expanded", "scaled", "multiplied", "accelerated"],
+    "reduced": ["minimized", "decreased", "lowered", "cut", "slashed", "diminished", "curtailed"],
+    "collaborated": ["partnered", "worked with", "cooperated", "teamed up", "joined forces"],
+    "delivered": ["executed", "completed", "achieved", "accomplished", "realized", "fulfilled"]
+}
+
+# Whole-word patterns for each tracked verb, compiled once at import
+_VERB_PATTERNS = {
+    verb: re.compile(r'\b' + re.escape(verb) + r'\b', re.IGNORECASE)
+    for verb in _VERB_ALTERNATIVES
+}
+
+# Alternatives for a verb repeated within one bullet point (e.g., "Architected and architected")
+_DUPLICATE_VERB_ALTERNATIVES = {
+    "architected": ["engineered", "designed", "built", "constructed"],
+    "architecting": ["engineering", "designing", "building", "constructing"],
+    "developed": ["engineered", "built", "designed", "created"],
+    "designed": ["architected", "crafted", "created", "engineered"],
+    "built": ["architected", "engineered", "constructed", "developed"],
+    "created": ["established", "built", "designed", "launched"],
+    "implemented": ["deployed", "integrated", "executed", "established"],
+}
+
+# Only the first alternative is ever used for an in-sentence duplicate
+_DUPLICATE_VERB_FIRST_ALTERNATIVE = {verb: alternatives[0] for verb, alternatives in _DUPLICATE_VERB_ALTERNATIVES.items()}
+
+# Common buzzwords to avoid (with replacements), keyed in lowercase
+_BUZZWORD_REPLACEMENTS = {
+    "self-starter": "proactive professional",
+    "self starter": "proactive professional",
+    "attention to detail": "meticulous approach",
+    "problem-solving": "analytical thinking",
+    "problem solving": "analytical thinking",
+    "proven track record": "demonstrated success",
+    "proven track": "demonstrated",
+    "team player": "collaborative professional",
+    "hard worker": "dedicated professional",
+    "go-getter": "results-driven",
+    "think outside the box": "innovative approach",
+    "synergy": "collaboration",
+    "leverage": "use",
+    "utilize": "use",
+    "action-oriented": "results-driven",
+    "detail-oriented": "meticulous",
+    "passionate": "committed",
+    "rockstar": "expert",
+    "ninja": "specialist",
+    "guru": "expert"
+}
+
+# All buzzwords as one whole-word alternation (longest first so "proven track record" beats "proven track")
+_BUZZWORD_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(buzzword) for buzzword in sorted(_BUZZWORD_REPLACEMENTS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+# Buzzword entries dropped from skills lists (lowercase)
+_BUZZWORD_SKILLS = frozenset({"self-starter", "attention to detail", "problem-solving", "team player", "hard worker"})
+
+def _buzzword_replacement(match):
+    """Replacement callback for _BUZZWORD_RE"""
+    return _BUZZWORD_REPLACEMENTS[match.group(1).lower()]
+
+# Markdown **bold** spans (non-greedy so several spans in one string stay separate)
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+
+# Whole-word tokens, matching the same spans as \b-anchored word patterns
+_WORD_RE = re.compile(r'\w+')
+
+# Punctuation stripped from words before duplicate comparison
+# (ASCII punctuation plus the typographic quotes/dashes AI output tends to use)
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation + '‘’“”–—…•')
+
+# Tokens for the duplicate-word pass: an HTML tag (e.g. <strong>, kept as-is), or a
+# whitespace-delimited word without its leading/trailing punctuation and never
+# crossing a tag, so "Next.js" stays whole but "(React," and "<strong>React</strong>" give "React"
+_WORD_TOKEN_RE = re.compile(r"<[^>]*>|\w(?:[^\s<>]*\w)?")
+
+# Degree words used to detect a bachelor's degree against an advanced-degree requirement
+_ADVANCED_DEGREE_WORDS = frozenset({"master", "masters", "phd", "doctorate"})
+_BACHELOR_DEGREE_WORDS = frozenset({"bachelor", "bachelors"})
+
+# Years of experience mentioned in a summary (e.g. "6+ years")
+_YEARS_RE = re.compile(r'(\d+)\+?\s*years?', re.IGNORECASE)
+
+def _fix_duplicate_words(text: str) -> str:
+    """
+    Replace repeated words in text with an alternative verb
+    Rewrites tokens in place, so punctuation, whitespace and HTML tags are kept
+    """
+    seen = set()
+    
+    def replace_duplicate(match):
+        word = match.group()
+        # HTML tags (e.g. <strong> around technical terms) are not words
+        if word[0] == "<":
+            return word
+        # Remove punctuation for comparison (case-insensitive)
+        word_clean = word.lower().translate(_PUNCT_TABLE)
+        if word_clean and word_clean in seen:
+            # This is a duplicate - replace with its first alternative
+            alt = _DUPLICATE_VERB_FIRST_ALTERNATIVE.get(word_clean, "engineered")
+            # Preserve capitalization
+            return alt.capitalize() if word[0].isupper() else alt
+        seen.add(word_clean)
+        return word
+    
+    return _WORD_TOKEN_RE.sub(replace_duplicate, text)
+
+def _resume_text_locations(resume_data):
+    """
+    Collect (container, key) for every string summary and highlight in resume_data
+    Order is the resume summary, then each experience's highlights followed by its summary
+    """
+    locations = []
+    if "summary" in resume_data and isinstance(resume_data["summary"], str):
+        locations.append((resume_data, "summary"))
+    
+    experience = resume_data.get("experience")
+    if isinstance(experience, list):
+        for exp in experience:
+            if "highlights" in exp and isinstance(exp["highlights"], list):
+                highlights = exp["highlights"]
+                for i, highlight in enumerate(highlights):
+                    if isinstance(highlight, str):
+                        locations.append((highlights, i))
+            if "summary" in exp and isinstance(exp["summary"], str):
+                locations.append((exp, "summary"))
+    return locations
+
+def fix_repetitive_verbs(resume_data, text_locations=None):
     """
     Fix repetitive action verbs in experience highlights and summary
     Ensures no verb is used more than 2 times across the entire resume
+    text_locations may be passed in from _resume_text_locations to skip re-collecting them
     """
     if "experience" not in resume_data or not isinstance(resume_data["experience"], list):
         return resume_data
     
-    # Common action verbs and their alternatives (expanded list)
-    verb_alternatives = {
-        "architected": ["engineered", "designed", "built", "constructed", "developed", "crafted", "established", "pioneered"],
-        "architecting": ["engineering", "designing", "building", "constructing", "developing", "crafting"],
-        "developed": ["architected", "engineered", "built", "designed", "created", "implemented", "delivered", "constructed", "established", "pioneered"],
-        "developing": ["architecting", "engineering", "building", "designing", "creating", "implementing", "delivering"],
-        "optimized": ["enhanced", "streamlined", "improved", "refined", "upgraded", "boosted", "maximized"],
-        "created": ["established", "founded", "built", "designed", "launched", "pioneered", "initiated", "introduced"],
-        "implemented": ["deployed", "integrated", "executed", "established", "introduced", "rolled out", "delivered"],
-        "built": ["architected", "engineered", "constructed", "developed", "designed", "crafted", "assembled"],
-        "designed": ["architected", "crafted", "created", "engineered", "planned", "conceptualized", "modeled"],
-        "led": ["spearheaded", "orchestrated", "managed", "directed", "headed", "guided", "championed"],
-        "managed": ["orchestrated", "supervised", "coordinated", "oversaw", "directed", "administered", "governed"],
-        "improved": ["enhanced", "optimized", "upgraded", "refined", "boosted", "elevated", "advanced"],
-        "increased": ["boosted", "enhanced", "amplified", "expanded", "scaled", "multiplied", "accelerated"],
-        "reduced": ["minimized", "decreased", "lowered", "cut", "slashed", "diminished", "curtailed"],
-        "collaborated": ["partnered", "worked with", "cooperated", "teamed up", "joined forces"],
-        "delivered": ["executed", "completed", "achieved", "accomplished", "realized", "fulfilled"]
-    }
-    
     # Track verb usage across summary and all experience
+    # Each text is addressed by (container, key) so it can be rewritten in place;
+    # texts holds the current value of every item in the same order
     verb_counts = {}
-    all_text_items = []
+    if text_locations is None:
+        text_locations = _resume_text_locations(resume_data)
+    texts = [container[key] for container, key in text_locations]
+    
+    # Count verb usage by tokenizing each text once into whole words,
+    # remembering which verbs each item contains. Replacements chain (an alternative
+    # can be another tracked verb), so verbs are first recorded in the order they are
+    # fixed: by first item, then by _VERB_ALTERNATIVES order within that item
+    item_verbs = []
+    for text in texts:
+        word_counts = {}
+        for word in _WORD_RE.findall(text.lower()):
+            if word in _VERB_ALTERNATIVES:
+                word_counts[word] = word_counts.get(word, 0) + 1
+        if word_counts:
+            for verb in _VERB_ALTERNATIVES:
+                if verb in word_counts:
+                    verb_counts[verb] = verb_counts.get(verb, 0) + word_counts[verb]
+        item_verbs.append(set(word_counts))
+    
+    # Only overused verbs (used more than 2 times) need the replacement pass;
+    # most resumes have none, so this usually skips straight to the duplicate check
+    overused_verbs = {verb: count for verb, count in verb_counts.items() if count > 2}
+    verb_items = {
+        verb: [item_index for item_index, found_verbs in enumerate(item_verbs) if verb in found_verbs]
+        for verb in overused_verbs
+    }
     
-    # Check summary
-    if "summary" in resume_data and isinstance(resume_data["summary"], str):
-        all_text_items.append(("summary", resume_data["summary"]))
-    
-    # Collect all highlights
-    for exp in resume_data["experience"]:
-        if "highlights" in exp and isinstance(exp["highlights"], list):
-            for highlight in exp["highlights"]:
-                all_text_items.append((exp, highlight))
-        # Also check experience summary
-        if "summary" in exp and isinstance(exp["summary"], str):
-            all_text_items.append((exp, exp["summary"]))
-    
-    # Count verb usage using regex for whole word matching (avoid double counting)
-    import re
-    for source, text in all_text_items:
-        if isinstance(text, str):
-            text_lower = text.lower()
-            # Count each verb using whole word boundary matching (only count once per text item)
-            for verb_key in verb_alternatives.keys():
-                pattern = r'\b' + re.escape(verb_key) + r'\b'
-                matches = re.findall(pattern, text_lower)
-                if matches:
-                    verb_counts[verb_key] = verb_counts.get(verb_key, 0) + len(matches)
-    
-    # Fix overused verbs (used more than 2 times)
-    for verb, count in verb_counts.items():
-        if count > 2:
-            alternatives = verb_alternatives.get(verb, [])
-            if alternatives:
-                replacement_count = 0
-                needed_replacements = count - 2
-                
-                # Create a list to track which items we've processed
-                processed_items = []
+    # Fix overused verbs
+    for verb, count in overused_verbs.items():
+        alternatives = _VERB_ALTERNATIVES.get(verb, [])
+        if alternatives:
+            replacement_count = 0
+            needed_replacements = count - 2
+            pattern = _VERB_PATTERNS[verb]
+            
+            for item_index in verb_items[verb]:
+                if replacement_count >= needed_replacements:
+                    break
+                text = texts[item_index]
                 
-                for source, text in all_text_items:
-                    if isinstance(text, str) and replacement_count < needed_replacements:
-                        text_lower = text.lower()
-                        pattern = r'\b' + re.escape(verb) + r'\b'
-                        
-                        # Check if verb exists in this text
-                        if re.search(pattern, text_lower):
-                            # Replace only the first occurrence in this text (to avoid replacing multiple times in same text)
-                            def replace_first(match):
-                                nonlocal replacement_count
-                                if replacement_count < needed_replacements:
-                                    alt_verb = alternatives[replacement_count % len(alternatives)]
-                                    replacement_count += 1
-                                    # Preserve capitalization
-                                    matched = match.group()
-                                    if matched and matched[0].isupper():
-                                        return alt_verb.capitalize()
-                                    return alt_verb
-                                return match.group()
-                            
-                            # Replace first occurrence only
-                            new_text = re.sub(pattern, replace_first, text, count=1, flags=re.IGNORECASE)
-                            
-                            if new_text != text:
-                                if source == "summary":
-                                    resume_data["summary"] = new_text
-                                    # Update the text in all_text_items for subsequent checks
-                                    for idx, (s, t) in enumerate(all_text_items):
-                                        if s == "summary" and t == text:
-                                            all_text_items[idx] = ("summary", new_text)
-                                            break
-                                elif isinstance(source, dict):
-                                    # Find and update the highlight or summary
-                                    if "highlights" in source and text in source["highlights"]:
-                                        highlight_index = source["highlights"].index(text)
-                                        source["highlights"][highlight_index] = new_text
-                                        # Update in all_text_items
-                                        for idx, (s, t) in enumerate(all_text_items):
-                                            if s == source and t == text and "highlights" in source:
-                                                all_text_items[idx] = (source, new_text)
-                                                break
-                                    elif "summary" in source and source["summary"] == text:
-                                        source["summary"] = new_text
-                                        # Update in all_text_items
-                                        for idx, (s, t) in enumerate(all_text_items):
-                                            if s == source and t == text and "summary" in source:
-                                                all_text_items[idx] = (source, new_text)
-                                                break
+                # Check if verb exists in this text (the pattern is case-insensitive,
+                # so the original text is searched without a lowercased copy)
+                if pattern.search(text):
+                    # Replace only the first occurrence in this text (to avoid replacing multiple times in same text)
+                    def replace_first(match):
+                        nonlocal replacement_count
+                        if replacement_count < needed_replacements:
+                            alt_verb = alternatives[replacement_count % len(alternatives)]
+                            replacement_count += 1
+                            # The alternative may itself be a tracked verb; keep its item index current
+                            if alt_verb in verb_items and item_index not in verb_items[alt_verb]:
+                                bisect.insort(verb_items[alt_verb], item_index)
+                            # Preserve capitalization
+                            matched = match.group()
+                            if matched and matched[0].isupper():
+                                return alt_verb.capitalize()
+                            return alt_verb
+                        return match.group()
+                    
+                    # Replace first occurrence only
+                    new_text = pattern.sub(replace_first, text, count=1)
+                    
+                    if new_text != text:
+                        container, key = text_locations[item_index]
+                        container[key] = new_text
+                        texts[item_index] = new_text
     
     # Also fix duplicate words in the same sentence (e.g., "Architected and architected")
-    # This handles cases where the same verb appears twice in one bullet point
-    verb_alternatives_for_duplicates = {
-        "architected": ["engineered", "designed", "built", "constructed"],
-        "architecting": ["engineering", "designing", "building", "constructing"],
-        "developed": ["engineered", "built", "designed", "created"],
-        "designed": ["architected", "crafted", "created", "engineered"],
-        "built": ["architected", "engineered", "constructed", "developed"],
-        "created": ["established", "built", "designed", "launched"],
-        "implemented": ["deployed", "integrated", "executed", "established"],
-    }
-    
-    for exp in resume_data.get("experience", []):
-        if "highlights" in exp and isinstance(exp["highlights"], list):
-            for i, highlight in enumerate(exp["highlights"]):
-                if isinstance(highlight, str):
-                    # Find duplicate words (case-insensitive, whole word matching)
-                    words = highlight.split()
-                    fixed_words = []
-                    seen_words_lower = {}
-                    for j, word in enumerate(words):
-                        word_lower = word.lower()
-                        # Remove punctuation for comparison
-                        word_clean = re.sub(r'[^\w]', '', word_lower)
-                        if word_clean and word_clean in seen_words_lower:
-                            # This is a duplicate - replace with alternative
-                            alternatives = verb_alternatives_for_duplicates.get(word_clean, ["engineered", "designed", "built"])
-                            alt = alternatives[0]  # Use first alternative
-                            # Preserve capitalization
-                            if word and word[0].isupper():
-                                alt = alt.capitalize()
-                            fixed_words.append(alt)
-                        else:
-                            seen_words_lower[word_clean] = j
-                            fixed_words.append(word)
-                    if len(fixed_words) == len(words) and fixed_words != words:
-                        exp["highlights"][i] = ' '.join(fixed_words)
-        # Also check experience summary
-        if "summary" in exp and isinstance(exp["summary"], str):
-            words = exp["summary"].split()
-            fixed_words = []
-            seen_words_lower = {}
-            for j, word in enumerate(words):
-                word_lower = word.lower()
-                word_clean = re.sub(r'[^\w]', '', word_lower)
-                if word_clean and word_clean in seen_words_lower:
-                    alternatives = verb_alternatives_for_duplicates.get(word_clean, ["engineered", "designed", "built"])
-                    alt = alternatives[0]
-                    if word and word[0].isupper():
-                        alt = alt.capitalize()
-                    fixed_words.append(alt)
-                else:
-                    seen_words_lower[word_clean] = j
-                    fixed_words.append(word)
-            if len(fixed_words) == len(words) and fixed_words != words:
-                exp["summary"] = ' '.join(fixed_words)
+    # This handles cases where the same verb appears twice in one bullet point;
+    # only experience highlights and summaries are checked, not the resume summary
+    for item_index, (container, key) in enumerate(text_locations):
+        if container is not resume_data:
+            container[key] = _fix_duplicate_words(texts[item_index])
     
     return resume_data
 
-def remove_buzzwords(resume_data):
+def remove_buzzwords(resume_data, text_locations=None):
     """
     Remove or replace common buzzwords and clichés from resume
     Based on Resume Worded analysis
+    text_locations may be passed in from _resume_text_locations to skip re-collecting them
     """
-    # Common buzzwords to avoid (with replacements)
-    buzzword_replacements = {
-        "self-starter": "proactive professional",
-        "self starter": "proactive professional",
-        "attention to detail": "meticulous approach",
-        "problem-solving": "analytical thinking",
-        "problem solving": "analytical thinking",
-        "proven track record": "demonstrated success",
-        "proven track": "demonstrated",
-        "team player": "collaborative professional",
-        "hard worker": "dedicated professional",
-        "go-getter": "results-driven",
-        "think outside the box": "innovative approach",
-        "synergy": "collaboration",
-        "leverage": "utilize" or "use",
-        "utilize": "use",
-        "action-oriented": "results-driven",
-        "detail-oriented": "meticulous",
-        "passionate": "committed" or "dedicated",
-        "rockstar": "expert",
-        "ninja": "specialist",
-        "guru": "expert"
-    }
+    if text_locations is None:
+        text_locations = _resume_text_locations(resume_data)
     
-    # Remove buzzwords from summary
-    if "summary" in resume_data and isinstance(resume_data["summary"], str):
-        summary = resume_data["summary"]
-        for buzzword, replacement in buzzword_replacements.items():
-            # Case-insensitive replacement
-            import re
-            pattern = r'\b' + re.escape(buzzword) + r'\b'
-            summary = re.sub(pattern, replacement, summary, flags=re.IGNORECASE)
-        resume_data["summary"] = summary
-    
-    # Remove buzzwords from experience summaries
-    if "experience" in resume_data and isinstance(resume_data["experience"], list):
-        for exp in resume_data["experience"]:
-            if "summary" in exp and isinstance(exp["summary"], str):
-                exp_summary = exp["summary"]
-                for buzzword, replacement in buzzword_replacements.items():
-                    import re
-                    pattern = r'\b' + re.escape(buzzword) + r'\b'
-                    exp_summary = re.sub(pattern, replacement, exp_summary, flags=re.IGNORECASE)
-                exp["summary"] = exp_summary
-            
-            # Remove buzzwords from highlights
-            if "highlights" in exp and isinstance(exp["highlights"], list):
-                for i, highlight in enumerate(exp["highlights"]):
-                    if isinstance(highlight, str):
-                        for buzzword, replacement in buzzword_replacements.items():
-                            import re
-                            pattern = r'\b' + re.escape(buzzword) + r'\b'
-                            highlight = re.sub(pattern, replacement, highlight, flags=re.IGNORECASE)
-                        exp["highlights"][i] = highlight
+    # Remove buzzwords from the summary, experience summaries and highlights
+    for container, key in text_locations:
+        # Case-insensitive replacement
+        container[key] = _BUZZWORD_RE.sub(_buzzword_replacement, container[key])
     
     # Remove buzzwords from skills section (especially soft skills)
     if "skills" in resume_data:
@@ -250,74 +324,64 @@ def remove_buzzwords(resume_data):
                     # Remove buzzword skills
                     skills[category] = [
                         skill for skill in skills[category] 
-                        if skill.lower() not in ["self-starter", "attention to detail", "problem-solving", "team player", "hard worker"]
+                        if skill.lower() not in _BUZZWORD_SKILLS
                     ]
                     # If category becomes empty, remove it
                     if not skills[category]:
                         del skills[category]
         elif isinstance(skills, list):
             # Remove buzzword skills from flat list
-            buzzword_skills = ["self-starter", "attention to detail", "problem-solving", "team player", "hard worker"]
             resume_data["skills"] = [
                 skill for skill in skills 
-                if skill.lower() not in [b.lower() for b in buzzword_skills]
+                if skill.lower() not in _BUZZWORD_SKILLS
             ]
     
     return resume_data
 
-def add_quantification_to_bullets(resume_data):
+def _has_bold(data):
     """
-    Add quantification to bullet points that lack numbers/metrics
-    This is a helper - the main quantification should come from the AI prompt
+    Check (iteratively) whether any string in a nested dict/list structure contains '**'
     """
-    if "experience" not in resume_data or not isinstance(resume_data["experience"], list):
-        return resume_data
-    
-    # Common quantification patterns to check for
-    quantification_patterns = [
-        r'\d+%',  # percentages
-        r'\d+\+',  # numbers with +
-        r'\$\d+',  # dollar amounts
-        r'\d+[KM]',  # thousands/millions
-        r'\d+\s*(seconds?|minutes?|hours?|days?|months?|years?)',  # time periods
-        r'\d+\s*(users?|requests?|features?|projects?|developers?|team members?)',  # counts
-    ]
-    
-    import re
-    
-    for exp in resume_data["experience"]:
-        if "highlights" in exp and isinstance(exp["highlights"], list):
-            for i, highlight in enumerate(exp["highlights"]):
-                if isinstance(highlight, str):
-                    # Check if already quantified
-                    has_quantification = any(re.search(pattern, highlight, re.IGNORECASE) for pattern in quantification_patterns)
-                    
-                    # If no quantification and highlight is substantial, add a note in comment
-                    # (We can't auto-add numbers, but we can ensure the prompt handles it)
-                    if not has_quantification and len(highlight.split()) > 5:
-                        # The AI should have added quantification, but if it didn't, 
-                        # we'll leave it as-is since we can't fabricate numbers
-                        pass
-    
-    return resume_data
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if '**' in item:
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
 
 def convert_markdown_bold_to_html(data):
     """
     Recursively convert markdown **bold** syntax to HTML <strong> tags
     in all string values of a dictionary or list.
+    Subtrees without any '**' are returned as-is instead of being rebuilt.
     """
+    # Only recurse into values that can hold strings; numbers, bools and None are returned as-is
     if isinstance(data, dict):
-        return {key: convert_markdown_bold_to_html(value) for key, value in data.items()}
+        if not _has_bold(data):
+            return data
+        return {
+            key: convert_markdown_bold_to_html(value) if isinstance(value, (dict, list, str)) else value
+            for key, value in data.items()
+        }
     elif isinstance(data, list):
-        return [convert_markdown_bold_to_html(item) for item in data]
+        if not _has_bold(data):
+            return data
+        return [
+            convert_markdown_bold_to_html(item) if isinstance(item, (dict, list, str)) else item
+            for item in data
+        ]
     elif isinstance(data, str):
+        if '**' not in data:
+            return data
         # Convert **text** to <strong>text</strong>
         # Handle multiple bold sections in the same string
-        text = data
-        # Pattern to match **text** but not **text**text** (greedy match)
         # Use non-greedy matching to handle multiple bold sections
-        text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-        return text
+        return _BOLD_RE.sub(r'<strong>\1</strong>', data)
     else:
         return data
 
@@ -342,9 +406,7 @@ def enforce_career_progression(resume_data, job_domain=""):
     if not domain:
         first_title = experiences[0].get("title", "")
         # Extract domain by removing level prefixes
-        title_clean = first_title
-        for prefix in ["Senior", "Lead", "Principal", "Staff", "Junior", "Mid-level", "Mid"]:
-            title_clean = title_clean.replace(prefix, "").strip()
+        title_clean = _LEVEL_PREFIX_RE.sub("", first_title).strip()
         domain = title_clean if title_clean else "Developer"
     
     # Determine base title format
@@ -353,34 +415,30 @@ def enforce_career_progression(resume_data, job_domain=""):
     else:
         base_title = f"{domain} Developer"
     
+    domain_lower = domain.lower()
+    
     # First (most recent) - should be Senior/Lead
     first_title = experiences[0].get("title", "")
-    if not any(word.lower() in first_title.lower() for word in ["Senior", "Lead", "Principal", "Staff"]):
+    senior_match = _SENIOR_RE.search(first_title)
+    if not senior_match:
         experiences[0]["title"] = f"Senior {base_title}"
     else:
         # Ensure domain is correct even if Senior is present
-        if domain.lower() not in first_title.lower():
-            # Replace with correct domain
-            for prefix in ["Senior", "Lead", "Principal", "Staff"]:
-                if prefix.lower() in first_title.lower():
-                    experiences[0]["title"] = f"{prefix} {base_title}"
-                    break
+        if domain_lower not in first_title.lower():
+            # Replace with correct domain, keeping the existing seniority prefix
+            experiences[0]["title"] = f"{senior_match.group(1).capitalize()} {base_title}"
     
     # Last (oldest) - MUST be entry level (cannot be Senior or Mid)
     if num_experiences >= 2:
         last_title = experiences[-1].get("title", "")
         # Remove any senior/mid level prefixes
-        last_title_clean = last_title
-        for prefix in ["Senior", "Lead", "Principal", "Staff", "Mid-level", "Mid"]:
-            if prefix.lower() in last_title_clean.lower():
-                last_title_clean = last_title_clean.replace(prefix, "").strip()
-                break
+        last_title_clean = _SENIORITY_PREFIX_RE.sub("", last_title, count=1).strip()
         
         # Ensure it's entry level - add "Junior" if it looks too advanced, or use base title
-        if any(word.lower() in last_title_clean.lower() for word in ["Senior", "Lead", "Principal", "Staff"]):
+        if _SENIOR_RE.search(last_title_clean):
             # Force entry level
             experiences[-1]["title"] = f"Junior {base_title}" if num_experiences > 1 else base_title
-        elif domain.lower() not in last_title_clean.lower():
+        elif domain_lower not in last_title_clean.lower():
             # Use base title or junior version for first job
             experiences[-1]["title"] = f"Junior {base_title}" if num_experiences > 2 else base_title
         else:
@@ -391,20 +449,78 @@ def enforce_career_progression(resume_data, job_domain=""):
     for i in range(1, num_experiences - 1):
         mid_title = experiences[i].get("title", "")
         # Remove Senior/Lead/Junior if present
-        mid_title_clean = mid_title
-        for prefix in ["Senior", "Lead", "Principal", "Staff", "Junior", "Mid-level", "Mid"]:
-            if prefix.lower() in mid_title_clean.lower():
-                mid_title_clean = mid_title_clean.replace(prefix, "").strip()
-                break
+        mid_title_clean = _LEVEL_PREFIX_RE.sub("", mid_title, count=1).strip()
         
         # Ensure domain is correct and it's mid-level (no prefix)
-        if domain.lower() not in mid_title_clean.lower():
+        if domain_lower not in mid_title_clean.lower():
             experiences[i]["title"] = base_title
         else:
             experiences[i]["title"] = mid_title_clean
     
     return resume_data
 
+# In-process LRU cache for AI extraction results, keyed by
+# (extraction kind, model identity, sha256 of the input text)
+_EXTRACTION_CACHE_MAXSIZE = 256
+_extraction_cache = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+def _extraction_cache_key(kind: str, text: str, model) -> tuple:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return (kind, id(model), digest)
+
+def _get_cached_extraction(key: tuple, model):
+    """
+    Return a copy of the cached result for key, or None on a miss
+    The stored model reference guards against id() reuse by a different model object
+    """
+    with _extraction_cache_lock:
+        entry = _extraction_cache.get(key)
+        if entry is None or entry[0] is not model:
+            return None
+        _extraction_cache.move_to_end(key)
+        return copy.deepcopy(entry[1])
+
+def _set_cached_extraction(key: tuple, model, result) -> None:
+    with _extraction_cache_lock:
+        _extraction_cache[key] = (model, copy.deepcopy(result))
+        _extraction_cache.move_to_end(key)
+        while len(_extraction_cache) > _EXTRACTION_CACHE_MAXSIZE:
+            _extraction_cache.popitem(last=False)
+
+# First markdown code block in a model response, with an optional json language tag;
+# an unterminated block runs to the end of the text
+_CODE_FENCE_RE = re.compile(r'```(?:json)?(.*?)(?:```|\Z)', re.DOTALL)
+
+def _strip_code_fence(text: str) -> str:
+    """
+    Return the contents of the first markdown code block in text,
+    or text unchanged if it has none
+    """
+    match = _CODE_FENCE_RE.search(text)
+    return match.group(1).strip() if match else text
+
+# Gemini-style generation config asking the model for a bare JSON object
+# (the model wrapper maps it to each provider's JSON output mode)
+_JSON_RESPONSE_CONFIG = {"response_mime_type": "application/json"}
+
+# Shared decoder for pulling a JSON object out of free-form model text
+_JSON_DECODER = json.JSONDecoder()
+
+def _parse_json_response(text: str):
+    """
+    Parse the JSON object in a model response
+    Decodes straight from the first "{", skipping any code fence or surrounding
+    text in one pass; falls back to the contents of the first code block
+    """
+    start = text.find("{")
+    if start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            pass
+    return json.loads(_strip_code_fence(text))
+
 def extract_skills_for_ats(job_description: str, model) -> dict:
     """
     Extract hard skills and soft skills from job description for ATS optimization
@@ -433,26 +549,25 @@ def extract_skills_for_ats(job_description: str, model) -> dict:
     Return ONLY a valid JSON object, no additional text.
     """
     
+    cache_key = _extraction_cache_key("skills", job_description, model)
+    cached = _get_cached_extraction(cache_key, model)
+    if cached is not None:
+        return cached
+    
     try:
-        response = model.generate_content(extract_prompt)
-        text = response.text.strip()
-        # Clean up JSON if wrapped in markdown
-        if '```json' in text:
-            json_str = text.split('```json', 1)[1].split('```', 1)[0].strip()
-        elif '```' in text:
-            json_str = text.split('```', 1)[1].split('```', 1)[0].strip()
-        else:
-            json_str = text
-        
-        result = json.loads(json_str)
+        response = model.generate_content(extract_prompt, generation_config=_JSON_RESPONSE_CONFIG)
+        # Parse the JSON object, even if wrapped in markdown
+        result = _parse_json_response(response.text)
         # Ensure all fields exist
-        return {
+        skills = {
             "hard_skills": result.get("hard_skills", []),
             "soft_skills": result.get("soft_skills", []),
             "keywords": result.get("keywords", []),
             "required_technologies": result.get("required_technologies", []),
             "preferred_technologies": result.get("preferred_technologies", [])
         }
+        _set_cached_extraction(cache_key, model, skills)
+        return skills
     except Exception as e:
         print(f"Error extracting skills: {e}")
         return {
@@ -483,18 +598,16 @@ def extract_education_requirements(job_description: str, model) -> dict:
     Return ONLY a valid JSON object, no additional text.
     """
     
+    cache_key = _extraction_cache_key("education", job_description, model)
+    cached = _get_cached_extraction(cache_key, model)
+    if cached is not None:
+        return cached
+    
     try:
-        response = model.generate_content(extract_prompt)
-        text = response.text.strip()
-        # Clean up JSON if wrapped in markdown
-        if '```json' in text:
-            json_str = text.split('```json', 1)[1].split('```', 1)[0].strip()
-        elif '```' in text:
-            json_str = text.split('```', 1)[1].split('```', 1)[0].strip()
-        else:
-            json_str = text
-        
-        result = json.loads(json_str)
+        response = model.generate_content(extract_prompt, generation_config=_JSON_RESPONSE_CONFIG)
+        # Parse the JSON object, even if wrapped in markdown
+        result = _parse_json_response(response.text)
+        _set_cached_extraction(cache_key, model, result)
         return result
     except Exception as e:
         print(f"Error extracting education requirements: {e}")
@@ -505,12 +618,15 @@ def extract_education_requirements(job_description: str, model) -> dict:
             "notes": ""
         }
 
+# Job description phrases signalling remote work, an on-site/location requirement, or relocation
+_REMOTE_RE = re.compile(r'\b(?:remote(?:ly)?|work from home|wfh|distributed team)\b', re.IGNORECASE)
+_ONSITE_RE = re.compile(r'\b(?:must be located in|based in|relocate to|onsite|on-site)\b', re.IGNORECASE)
+_RELOCATION_RE = re.compile(r'\b(?:relocation|relocate)\b', re.IGNORECASE)
+
 def extract_address_requirements(job_description: str) -> dict:
     """
     Extract address/location requirements from job description
     """
-    job_lower = job_description.lower()
-    
     requirements = {
         "requires_address": False,
         "location_preference": None,
@@ -519,16 +635,13 @@ def extract_address_requirements(job_description: str) -> dict:
     }
     
     # Check for remote work mentions
-    if any(term in job_lower for term in ["remote", "work from home", "wfh", "distributed team"]):
-        requirements["remote_allowed"] = True
+    requirements["remote_allowed"] = _REMOTE_RE.search(job_description) is not None
     
     # Check for location-specific requirements
-    if any(term in job_lower for term in ["must be located in", "based in", "relocate to", "onsite", "on-site"]):
-        requirements["requires_address"] = True
+    requirements["requires_address"] = _ONSITE_RE.search(job_description) is not None
     
     # Check for relocation mentions
-    if any(term in job_lower for term in ["relocation", "relocate", "willing to relocate"]):
-        requirements["relocation_required"] = True
+    requirements["relocation_required"] = _RELOCATION_RE.search(job_description) is not None
     
     return requirements
 
@@ -566,18 +679,91 @@ def extract_job_title(job_description: str, model) -> str:
     Return the exact job title (e.g., "Full-stack Engineer", "Senior Software Developer", "Product Manager").
     """
     
+    cache_key = _extraction_cache_key("job_title", job_description, model)
+    cached = _get_cached_extraction(cache_key, model)
+    if cached is not None:
+        return cached
+    
     try:
         response = model.generate_content(extract_prompt)
-        job_title = response.text.strip()
-        # Clean up if wrapped in quotes or markdown
-        job_title = job_title.strip('"\'`')
-        if job_title.startswith('```'):
-            job_title = job_title.split('```')[1].strip()
+        # Clean up if wrapped in markdown or quotes
+        job_title = _strip_code_fence(response.text.strip()).strip('"\'`')
+        _set_cached_extraction(cache_key, model, job_title)
         return job_title
     except Exception as e:
         print(f"Error extracting job title: {e}")
         return ""
 
+def extract_job_context(job_description: str, model) -> dict:
+    """
+    Extract the job title, ATS skills and education requirements in a single AI call
+    Returns dict with job_title, skills and education, shaped like the results of
+    extract_job_title, extract_skills_for_ats and extract_education_requirements,
+    or None if the combined reply could not be used
+    """
+    extract_prompt = f"""
+    Analyze the following job description and extract the job title, ALL skills and keywords for ATS (Applicant Tracking System) matching, and the education requirements.
+    
+    JOB DESCRIPTION:
+    {job_description}
+    
+    Identify and return a JSON object with:
+    1. job_title: The exact job title (e.g., "Full-stack Engineer", "Senior Software Developer", "Product Manager")
+    2. hard_skills: A comprehensive list of ALL technical skills, technologies, tools, frameworks, languages, platforms mentioned (e.g., ["React", "TypeScript", "Node.js", "AWS", "Docker", "GraphQL", "REST API", "PostgreSQL", "MongoDB", "Jest", "Cypress", "Git", "CI/CD", "Agile", "Scrum"])
+    3. soft_skills: A list of soft skills, personal attributes, and behavioral competencies mentioned (e.g., ["Communication", "Teamwork", "Leadership", "Problem-solving", "Collaboration", "Time management"])
+    4. keywords: A list of important keywords, phrases, and terms that should appear in the resume (include technical terms, methodologies, industry terms)
+    5. required_technologies: Specific technologies that are explicitly required (prioritize these)
+    6. preferred_technologies: Technologies mentioned as "nice to have" or "preferred"
+    7. education_level: The required education level (e.g., "Bachelor's degree", "Master's degree", "Advanced degree", "PhD", "High school", "Associate's degree", or "Not specified")
+    8. degree_type: The type of degree if specified (e.g., "Computer Science", "Engineering", "Business", etc.) or "Any" if not specified
+    9. is_required: true if education is required, false if preferred or not mentioned
+    10. notes: Any additional education-related notes or requirements
+    
+    IMPORTANT:
+    - Extract EVERY technical skill mentioned, even if it's just mentioned once
+    - Include variations (e.g., "React" and "React.js" if both appear)
+    - Include methodologies (e.g., "Agile", "Scrum", "DevOps", "CI/CD")
+    - Include tools and platforms (e.g., "AWS", "Docker", "Kubernetes", "GitHub")
+    - Be comprehensive - ATS systems match on exact keywords
+    
+    Return ONLY a valid JSON object, no additional text.
+    """
+    
+    cache_key = _extraction_cache_key("job_context", job_description, model)
+    cached = _get_cached_extraction(cache_key, model)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = model.generate_content(extract_prompt, generation_config=_JSON_RESPONSE_CONFIG)
+        # Parse the JSON object, even if wrapped in markdown
+        result = _parse_json_response(response.text)
+        job_title = result.get("job_title") or ""
+        if not isinstance(job_title, str):
+            raise ValueError(f"job_title is not a string: {job_title!r}")
+        # Split the flat reply into the shapes the separate extractors return
+        context = {
+            "job_title": job_title.strip().strip('"\'`'),
+            "skills": {
+                "hard_skills": result.get("hard_skills", []),
+                "soft_skills": result.get("soft_skills", []),
+                "keywords": result.get("keywords", []),
+                "required_technologies": result.get("required_technologies", []),
+                "preferred_technologies": result.get("preferred_technologies", [])
+            },
+            "education": {
+                "education_level": result.get("education_level", "Not specified"),
+                "degree_type": result.get("degree_type", "Any"),
+                "is_required": result.get("is_required", False),
+                "notes": result.get("notes", "")
+            }
+        }
+        _set_cached_extraction(cache_key, model, context)
+        return context
+    except Exception as e:
+        print(f"Error extracting job context: {e}")
+        return None
+
 def job_title_in_resume(job_title: str, resume_data: dict) -> bool:
     """
     Check if the job title exists anywhere in the resume (in experience titles or summary)
@@ -593,6 +779,9 @@ def job_title_in_resume(job_title: str, resume_data: dict) -> bool:
         return True
     
     # Check in experience titles
+    # Words of the job title are loop-invariant, so split them once
+    job_title_words = frozenset(job_title_lower.split())
+    min_overlap = max(len(job_title_words), 1) * 0.5
     experiences = resume_data.get("experience", [])
     for exp in experiences:
         title = exp.get("title", "").lower()
@@ -600,10 +789,8 @@ def job_title_in_resume(job_title: str, resume_data: dict) -> bool:
         if job_title_lower in title or title in job_title_lower:
             return True
         # Also check individual words for partial matches
-        job_title_words = set(job_title_lower.split())
-        title_words = set(title.split())
         # If more than 50% of words match, consider it found
-        if len(job_title_words.intersection(title_words)) / max(len(job_title_words), 1) > 0.5:
+        if len(job_title_words.intersection(title.split())) > min_overlap:
             return True
     
     return False
@@ -619,18 +806,9 @@ def generate_headline(job_title: str, resume_data: dict, model) -> str:
     summary = resume_data.get("summary", "")
     
     # Extract years of experience from summary if available
-    years_match = re.search(r'(\d+)\+?\s*years?', summary, re.IGNORECASE)
+    years_match = _YEARS_RE.search(summary)
     years_exp = years_match.group(1) if years_match else ""
     
-    # Extract key technologies from summary (first few mentioned)
-    tech_keywords = []
-    common_tech = ['React', 'Python', 'JavaScript', 'Node.js', 'AWS', 'Shopify', 'TypeScript', 'Next.js', 'Docker', 'Kubernetes']
-    for tech in common_tech:
-        if tech.lower() in summary.lower():
-            tech_keywords.append(tech)
-            if len(tech_keywords) >= 3:
-                break
-    
     headline_prompt = f"""
     Create a professional headline for a resume based on the following information:
     
@@ -654,6 +832,12 @@ def generate_headline(job_title: str, resume_data: dict, model) -> str:
     Return ONLY the headline text, nothing else. Do not include quotes or markdown formatting.
     """
     
+    # The prompt holds every input the headline depends on, so it is the cache key
+    cache_key = _extraction_cache_key("headline", headline_prompt, model)
+    cached = _get_cached_extraction(cache_key, model)
+    if cached is not None:
+        return cached
+    
     try:
         response = model.generate_content(headline_prompt)
         headline = response.text.strip()
@@ -672,6 +856,7 @@ def generate_headline(job_title: str, resume_data: dict, model) -> str:
             # If AI didn't include job title, prepend it
             headline = f"{job_title} | {headline}"
         
+        _set_cached_extraction(cache_key, model, headline)
         return headline
     except Exception as e:
         print(f"Error generating headline: {e}")
@@ -681,126 +866,32 @@ def generate_headline(job_title: str, resume_data: dict, model) -> str:
         else:
             return job_title
 
-def tailor_resume(job_description, model, template = "resume_templates/michael.json"):
+def _join_limited(items, limit):
     """
-    Tailor the resume based on the job description
-    Uses the template resume JSON and creates a tailored version
+    Join the first `limit` items with commas, adding an ellipsis when the list was truncated
     """
-    # Load the template resume
-    template_path = os.path.join(os.path.dirname(__file__), template)
-    with open(template_path, "r") as f:
-        resume_structure = json.load(f)
-    
-    # Extract job title from job description
-    job_title = extract_job_title(job_description, model)
-    
-    # Extract domain from job title (e.g., "Full Stack", "Shopify", "iOS", "Frontend")
-    domain = ""
-    if job_title:
-        job_title_lower = job_title.lower()
-        # Extract domain keywords
-        domain_keywords = {
-            "full stack": "Full Stack",
-            "full-stack": "Full Stack",
-            "shopify": "Shopify",
-            "ios": "iOS",
-            "android": "Android",
-            "react": "React",
-            "angular": "Angular",
-            "vue": "Vue",
-            "node": "Node.js",
-            "python": "Python",
-            "java": "Java",
-            "frontend": "Frontend",
-            "front-end": "Frontend",
-            "backend": "Backend",
-            "back-end": "Backend",
-            "devops": "DevOps",
-            "cloud": "Cloud",
-            "mobile": "Mobile"
-        }
-        for keyword, domain_name in domain_keywords.items():
-            if keyword in job_title_lower:
-                domain = domain_name
-                break
-        
-        # If no specific domain found, try to extract from job title structure
-        if not domain:
-            # Remove common level prefixes
-            title_clean = job_title
-            for prefix in ["Senior", "Lead", "Principal", "Staff", "Junior", "Mid-level", "Mid"]:
-                title_clean = title_clean.replace(prefix, "").strip()
-            # Use the remaining as domain
-            if title_clean:
-                domain = title_clean
-    
-    # Check if job title exists in resume
-    title_found = job_title_in_resume(job_title, resume_structure) if job_title else False
-    
-    # Always generate headline based on job description to ensure it's included
-    # This helps with ATS (Applicant Tracking Systems) and recruiter searches
-    headline = ""
-    if job_title:
-        headline = generate_headline(job_title, resume_structure, model)
-        # If title not found, we'll also mention it in the prompt to add it to summary
-    
-    # Extract skills for ATS optimization (critical for Jobscan match rate)
-    skills_analysis = extract_skills_for_ats(job_description, model)
-    hard_skills = skills_analysis.get("hard_skills", [])
-    soft_skills = skills_analysis.get("soft_skills", [])
-    keywords = skills_analysis.get("keywords", [])
-    required_tech = skills_analysis.get("required_technologies", [])
-    
-    # Extract education requirements from job description
-    education_requirements = extract_education_requirements(job_description, model)
-    
-    # Extract address requirements
-    address_requirements = extract_address_requirements(job_description)
-    
-    # Validate current address
-    contact = resume_structure.get("contact", {})
-    address_valid, address_error = validate_address(contact)
-    
-    # Check education match
-    current_education = resume_structure.get("education", {})
-    current_degree = current_education.get("degree", "") if isinstance(current_education, dict) else ""
-    education_mismatch = False
-    education_note = ""
-    
-    if education_requirements.get("education_level") and education_requirements["education_level"] != "Not specified":
-        required_level = education_requirements["education_level"].lower()
-        current_degree_lower = current_degree.lower()
-        
-        # Check for mismatches
-        if "advanced degree" in required_level or "master" in required_level or "phd" in required_level or "doctorate" in required_level:
-            if "bachelor" in current_degree_lower and "master" not in current_degree_lower and "phd" not in current_degree_lower and "doctorate" not in current_degree_lower:
-                education_mismatch = True
-                education_note = f"The job requires {education_requirements['education_level']}, but the resume shows {current_degree}. If experience is strong, this should be addressed in the summary."
-    
-    # Create the tailoring prompt
-    tailoring_prompt = f"""
-    I need to tailor my resume for a specific job. I'll provide my current resume structure in JSON format and the job description.
-    
-    JOB DESCRIPTION:
-    {job_description}
-    
-    MY CURRENT RESUME (in JSON format):
-    {json.dumps(resume_structure, indent=2)}
+    return ', '.join(items[:limit]) + ('...' if len(items) > limit else '')
+
+# Summary instruction added to the tailoring prompt when the degree falls short of the job requirement
+_EDUCATION_MISMATCH_INSTRUCTION = "CRITICAL - EDUCATION MISMATCH: The job requires {required_education_level} but my resume shows {current_degree}. REQUIRED: Add a professional note at the END of the summary (as the final 1-2 sentences) explaining how strong experience compensates. Calculate years from experience section and use that number. Example: 'While the position may prefer an advanced degree, my 7+ years of hands-on experience in [relevant technologies from job description] demonstrate equivalent expertise and practical knowledge that aligns with the role requirements.' Make it specific to the job - mention relevant technologies/skills from the job description."
+
+# Instructions for the main tailoring call. This text never changes between requests,
+# so it comes first and forms a stable prompt prefix that providers can cache;
+# every per-request value lives in _TAILORING_CONTEXT, which is appended after it
+_TAILORING_INSTRUCTIONS = """
+    I need to tailor my resume for a specific job. My current resume structure in JSON format, the job description and the job-specific values referred to below are provided in the JOB CONTEXT section at the end.
     
     CRITICAL REQUIREMENTS TO ADDRESS:
     
     A. ADDRESS/LOCATION VALIDATION:
-       - Current address status: {"✓ Complete" if address_valid else f"✗ {address_error}"}
-       - Current location in resume: "{contact.get('location', 'MISSING')}"
+       - Check the current address status and current location given under ADDRESS in the JOB CONTEXT
        - REQUIRED: Ensure the "location" field in contact contains a COMPLETE address
        - Format should be: "City, State/Province, Country" (e.g., "Bandung, West Java, Indonesia")
        - If address is missing or incomplete, use the existing location but make it more complete
        - Recruiters use addresses to validate location for job matches - this is critical for ATS systems
     
     B. EDUCATION REQUIREMENTS MATCH:
-       - Job requires: {education_requirements.get('education_level', 'Not specified')}
-       - Current education: {current_degree if current_degree else 'Not specified'}
-       - Education match status: {"✓ Matches" if not education_mismatch else f"✗ MISMATCH - {education_note}"}
+       - Compare the job's education requirement with my current education using the match status given under EDUCATION in the JOB CONTEXT
        - If there's a mismatch (e.g., job requires Advanced degree but resume shows Bachelor's):
          * Keep the actual education degree as-is (do not falsify)
          * BUT add a note in the SUMMARY section explaining how strong experience compensates
@@ -808,11 +899,7 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
          * This addresses the mismatch professionally without misrepresenting qualifications
     
     C. CRITICAL ATS OPTIMIZATION - SKILLS MATCHING (This directly affects Jobscan match rate):
-       - HARD SKILLS REQUIRED: {len(hard_skills)} skills found in job description
-       - Required hard skills: {', '.join(hard_skills[:15])}{'...' if len(hard_skills) > 15 else ''}
-       - SOFT SKILLS REQUIRED: {len(soft_skills)} skills found
-       - Required soft skills: {', '.join(soft_skills) if soft_skills else 'None specified'}
-       - KEYWORDS TO INCLUDE: {len(keywords)} important keywords
+       - The required hard skills, soft skills and keyword count are given under ATS SKILLS in the JOB CONTEXT
        - CRITICAL: ALL of these skills MUST appear in the resume in multiple places:
          * Summary section: Include as many hard skills as possible (use <strong> tags)
          * Skills section: List ALL hard skills from job description, prioritize required ones
@@ -824,20 +911,20 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
     Based on the job description, please create a tailored version of my resume by modifying the following sections:
     
     0. Headline (NEW FIELD - REQUIRED - add this to the JSON):
-       - The job title from the job description is: "{job_title}"
+       - The job title from the job description is the JOB TITLE given in the JOB CONTEXT
        - ALWAYS create a "headline" field with a professional headline that includes the exact job title
-       - The headline should be: "{headline}" (use this exact headline)
+       - The headline should be the HEADLINE given in the JOB CONTEXT (use this exact headline)
        - The headline format should be: "[Job Title] | [Key Qualification/Experience]"
        - This headline is critical for ATS (Applicant Tracking Systems) to find the resume when recruiters search by job title
        - Even if the job title appears elsewhere in the resume, include this headline field
     
     1. Summary: Rewrite to emphasize skills and experiences relevant to this specific job
        - Use <strong>bold</strong> formatting for ALL technical skills from the job description
-       - MUST INCLUDE as many hard skills as possible: {', '.join(hard_skills[:10])}{'...' if len(hard_skills) > 10 else ''}
+       - MUST INCLUDE as many hard skills as possible, starting with the first ten required hard skills
        - Make the summary concise but comprehensive - aim for 3-4 sentences that pack in keywords
-       - If the job title "{job_title}" is not in my resume, consider mentioning it in the summary as well
-       - Integrate soft skills naturally: {', '.join(soft_skills) if soft_skills else 'None'}
-       - {"CRITICAL - EDUCATION MISMATCH: The job requires {education_requirements.get('education_level', 'Advanced degree')} but my resume shows {current_degree}. REQUIRED: Add a professional note at the END of the summary (as the final 1-2 sentences) explaining how strong experience compensates. Calculate years from experience section and use that number. Example: 'While the position may prefer an advanced degree, my 7+ years of hands-on experience in [relevant technologies from job description] demonstrate equivalent expertise and practical knowledge that aligns with the role requirements.' Make it specific to the job - mention relevant technologies/skills from the job description." if education_mismatch else ""}
+       - If the job title is not in my resume, consider mentioning it in the summary as well
+       - Integrate the required soft skills naturally
+       - Follow the summary education note given under EDUCATION in the JOB CONTEXT, if there is one
        - ATS OPTIMIZATION: The summary is scanned first - include maximum keywords here
        - AVOID REPETITION: Don't repeat the same phrases or words multiple times in the summary
        - AVOID BUZZWORDS: DO NOT use vague buzzwords like "self-starter", "attention to detail", "problem-solving", "proven track record", "team player", "hard worker", "go-getter", "think outside the box", "synergy", "leverage", "action-oriented", "detail-oriented", "passionate", "rockstar", "ninja", "guru"
@@ -847,8 +934,8 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
     2. Experience: For each experience entry (CRITICAL - CREATE TITLES BASED ON JOB DESCRIPTION):
        - Keep the company name and period the same
        - DO NOT use the template job titles - CREATE NEW TITLES based on the job description domain
-       - The job title from the job description is: "{job_title}"
-       - The domain to use is: "{domain}" (extract from job title)
+       - The job title from the job description is the JOB TITLE given in the JOB CONTEXT
+       - The domain to use is the DOMAIN given in the JOB CONTEXT (extracted from the job title)
        - CRITICAL CAREER PROGRESSION RULES (based on chronological order - oldest to newest):
          * The LAST job in the list (OLDEST/FIRST job chronologically) MUST be ENTRY LEVEL:
            - Use: "Junior [Domain] Developer", "[Domain] Developer", or "Web Developer" (for first job)
@@ -895,14 +982,13 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
        - For each highlight, incorporate 2-3 hard skills from the job description naturally
        - Use <strong>bold</strong> tags for technical terms (e.g., "Built <strong>React</strong> applications using <strong>TypeScript</strong> and <strong>GraphQL</strong>")
        - Re-write and tailor each highlight to include job description keywords
-       - Ensure required technologies appear in experience: {', '.join(required_tech[:8]) if required_tech else 'All hard skills'}
+       - Ensure the first eight required technologies listed under ATS SKILLS appear in experience
        - Adjust the skills array in each experience to include relevant hard skills from job description
        - Each experience entry should have 4-6 strong, quantified highlights
     
     3. Skills: CRITICAL - This section directly affects ATS match rate
-       - MUST INCLUDE ALL hard skills from job description: {len(hard_skills)} skills total
-       - Required hard skills to include: {', '.join(hard_skills[:20])}{'...' if len(hard_skills) > 20 else ''}
-       - Prioritize required technologies: {', '.join(required_tech) if required_tech else 'All hard skills'}
+       - MUST INCLUDE ALL hard skills from job description (the required hard skills under ATS SKILLS)
+       - Prioritize the required technologies listed under ATS SKILLS
        - Organize skills into logical categories (e.g., "Frontend", "Backend", "Tools", "Methodologies")
        - Use EXACT terminology from job description (if job says "React", use "React" not "React.js")
        - Keep relevant existing skills that match job requirements
@@ -913,16 +999,13 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
        - ATS systems scan this section - completeness is critical for match rate
     
     Do NOT modify:
-    - Name
     - Company names and dates
     - Education factual information (degree name, university name, period) - keep these factual
     
     MUST MODIFY:
     4. Education: CRITICAL - Tailor the education section description based on job description
        - Keep factual information unchanged: degree name, university name, and period (dates) - DO NOT modify these
-       - Job education requirements: {education_requirements.get('education_level', 'Not specified')}
-       - Degree type preferred: {education_requirements.get('degree_type', 'Any')}
-       - Current education: {current_degree if current_degree else 'Not specified'}
+       - Use the job education requirements, preferred degree type and current education given under EDUCATION in the JOB CONTEXT
        - REQUIRED: Create or modify the "description" field in the education section to match the job description
        - The description should highlight:
          * Relevant coursework that matches job requirements (e.g., if job mentions AI/ML, highlight AI/ML courses; if job mentions databases, highlight database courses)
@@ -941,8 +1024,8 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
        - IMPORTANT: The description must be DIFFERENT for each job application - it should reflect the specific job description requirements
     
     MUST MODIFY:
-    - Contact location: {"Ensure location is complete (City, State/Province, Country format)" if not address_valid else "Keep location as-is"}
-    - Summary: {"Add note about experience compensating for education if needed" if education_mismatch else "Standard tailoring"}
+    - Contact location: follow the contact location instruction given under ADDRESS in the JOB CONTEXT
+    - Summary: follow the summary instruction given under EDUCATION in the JOB CONTEXT
     
     CRITICAL FORMATTING RULES:
     - Use ONLY HTML <strong>bold</strong> tags for all technical terms and skills (like <strong>JavaScript</strong>, <strong>Python</strong>, <strong>AWS</strong>, etc)
@@ -1000,21 +1083,311 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
     Return ONLY a JSON object with the same structure as the input but with tailored content. 
     Do not include any explanations or additional text outside the JSON.
     """
+
+# Per-request values for the tailoring call, filled in with str.format and appended to _TAILORING_INSTRUCTIONS
+_TAILORING_CONTEXT = """
+    JOB CONTEXT:
     
-    response = model.generate_content(tailoring_prompt)
+    JOB DESCRIPTION:
+    {job_description}
+    
+    MY CURRENT RESUME (in JSON format):
+    {resume_json}
+    
+    JOB TITLE: "{job_title}"
+    HEADLINE: "{headline}"
+    DOMAIN: "{domain}"
+    
+    ADDRESS:
+    - Current address status: {address_status}
+    - Current location in resume: "{current_location}"
+    - Contact location instruction: {location_instruction}
+    
+    EDUCATION:
+    - Job requires: {required_education_level}
+    - Degree type preferred: {degree_type}
+    - Current education: {current_education}
+    - Education match status: {education_status}
+    - Summary instruction: {summary_instruction}
+    - Summary education note: {education_mismatch_instruction}
+    
+    ATS SKILLS:
+    - HARD SKILLS REQUIRED: {hard_skills_count} skills found in job description
+    - Required hard skills: {hard_skills_top20}
+    - Required technologies: {required_tech_all}
+    - SOFT SKILLS REQUIRED: {soft_skills_count} skills found
+    - Required soft skills: {soft_skills_required}
+    - KEYWORDS TO INCLUDE: {keywords_count} important keywords
+    """
+
+def _find_missing_skills(hard_skills, existing_skills):
+    """
+    Return the hard skills not already covered by existing_skills
+    A skill is covered when it and an existing skill contain one another
+    case-insensitively (e.g. "React" and "React.js"); repeated hard skills
+    are only returned once
+    """
+    existing_lower = {skill.lower() for skill in existing_skills}
+    # Exact hits skip the substring checks; when every hard skill is one
+    # (the usual case), the alternation below is never built
+    candidates = []
+    for skill in hard_skills:
+        skill_lower = skill.lower()
+        if skill_lower not in existing_lower:
+            candidates.append((skill, skill_lower))
+    if not candidates:
+        return []
+    
+    # A skill inside any existing skill is found with one scan of the joined names,
+    # and any existing skill inside a skill with one search of an alternation
+    existing_re = None
+    if existing_lower:
+        joined_existing = "\0".join(existing_lower)
+        existing_re = re.compile("|".join(re.escape(skill) for skill in existing_lower))
+    
+    missing_skills = []
+    for skill, skill_lower in candidates:
+        # Skills already returned skip the substring checks
+        if skill_lower in existing_lower:
+            continue
+        if existing_re is not None and (skill_lower in joined_existing or existing_re.search(skill_lower)):
+            continue
+        existing_lower.add(skill_lower)
+        missing_skills.append(skill)
+    return missing_skills
+
+@functools.lru_cache(maxsize=16)
+def _read_template(template_path):
+    """
+    Read a resume template JSON file or the main markdown output template, cached by path
+    Callers parse JSON text themselves, so every caller gets its own mutable copy
+    """
+    with open(template_path, "r") as f:
+        return f.read()
+
+# Templates are resolved relative to this module: the main markdown output template
+# and the directory holding its section templates
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_OUTPUT_TEMPLATE_PATH = os.path.join(_MODULE_DIR, "output_template.md")
+_OUTPUT_TEMPLATE_DIR = os.path.join(_MODULE_DIR, "output_template")
+
+@functools.lru_cache(maxsize=None)
+def _load_output_template(filename):
+    """
+    Read a markdown section template from the output_template directory, cached by file name
+    """
+    with open(os.path.join(_OUTPUT_TEMPLATE_DIR, filename), "r") as f:
+        return f.read()
+
+# Top-level template fields the model must not change; they are left out of the
+# tailoring prompt and copied back from the template afterwards. Contact details
+# are sent as the location only, since that is the one contact field it may edit
+_PROMPT_OMITTED_FIELDS = frozenset({"name", "references"})
+
+@functools.lru_cache(maxsize=8)
+def _template_prompt_json(template_path):
+    """
+    Serialize the editable part of a resume template for the tailoring prompt,
+    cached by absolute path
+    """
+    resume_structure = json.loads(_read_template(template_path))
+    prompt_resume = {}
+    for key, value in resume_structure.items():
+        if key in _PROMPT_OMITTED_FIELDS:
+            continue
+        if key == "contact" and isinstance(value, dict):
+            value = {"location": value["location"]} if "location" in value else {}
+        prompt_resume[key] = value
+    return json.dumps(prompt_resume, ensure_ascii=False)
+
+def _merge_template_fields(resume_structure, tailored_resume):
+    """
+    Restore the template fields left out of the tailoring prompt
+    Keys follow the template order, with any new fields (e.g. headline) after them
+    """
+    merged = {}
+    for key, value in resume_structure.items():
+        if key in _PROMPT_OMITTED_FIELDS:
+            merged[key] = value
+        elif key == "contact" and isinstance(value, dict):
+            contact = tailored_resume.get("contact")
+            merged[key] = {**value, **contact} if isinstance(contact, dict) else value
+        elif key in tailored_resume:
+            merged[key] = tailored_resume[key]
+    for key, value in tailored_resume.items():
+        merged.setdefault(key, value)
+    return merged
+
+def _output_file_path(name, extension, output_dir=None, timestamp=None):
+    """
+    Return the path of a timestamped output file, e.g. output/tailored_resume_<timestamp>.json
+    Without output_dir the default output directory is used (and created if needed);
+    callers passing output_dir must make sure it exists. Without timestamp the current time is used
+    """
+    if output_dir is None:
+        output_dir = Path("output")
+        output_dir.mkdir(exist_ok=True)
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return Path(output_dir) / f"{name}_{timestamp}.{extension}"
+
+def _load_json_file(path):
+    """
+    Load a JSON file, parsing with orjson when it is installed
+    """
+    if HAS_ORJSON:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _dump_json_bytes(data):
+    """
+    Serialize data as 2-space indented UTF-8 JSON, using orjson when it is installed
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def _save_tailored_resume(tailored_resume):
+    """
+    Save the tailored resume to a timestamped JSON file in the output directory
+    Returns the file path
+    """
+    json_file_path = _output_file_path("tailored_resume", "json")
+    
+    json_file_path.write_bytes(_dump_json_bytes(tailored_resume))
+    
+    return json_file_path
+
+def tailor_resume(job_description, model, template = "resume_templates/michael.json", use_cache=True):
+    """
+    Tailor the resume based on the job description
+    Uses the template resume JSON and creates a tailored version
+    Pass use_cache=False to generate a fresh version even if this job was already tailored
+    """
+    # Load the template resume
+    template_path = os.path.abspath(os.path.join(_MODULE_DIR, template))
+    
+    # Reuse the finished resume when the same template was already tailored to this job;
+    # case and whitespace differences (e.g. re-pasted job posts) still hit the cache.
+    # A fresh version (use_cache=False) replaces the cached one
+    normalized_job_description = " ".join(job_description.split()).casefold()
+    cache_key = _extraction_cache_key("tailored_resume", f"{template_path}\0{normalized_job_description}", model)
+    if use_cache:
+        cached = _get_cached_extraction(cache_key, model)
+        if cached is not None:
+            return _save_tailored_resume(cached), cached
+    
+    resume_structure = json.loads(_read_template(template_path))
+    
+    # Extract job title, skills for ATS optimization (critical for Jobscan match rate)
+    # and education requirements from the job description in one AI call
+    job_context = extract_job_context(job_description, model)
+    if job_context is not None:
+        job_title = job_context["job_title"]
+        skills_analysis = job_context["skills"]
+        education_requirements = job_context["education"]
+    else:
+        # Fall back to the separate extractors; skills and education only depend on the
+        # job description, so they run in worker threads while the title is extracted here
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            skills_future = executor.submit(extract_skills_for_ats, job_description, model)
+            education_future = executor.submit(extract_education_requirements, job_description, model)
+            job_title = extract_job_title(job_description, model)
+            skills_analysis = skills_future.result()
+            education_requirements = education_future.result()
+    
+    # Always generate headline based on job description to ensure it's included
+    # This helps with ATS (Applicant Tracking Systems) and recruiter searches
+    headline = ""
+    if job_title:
+        headline = generate_headline(job_title, resume_structure, model)
+        # If title not found, we'll also mention it in the prompt to add it to summary
+    
+    # Extract domain from job title (e.g., "Full Stack", "Shopify", "iOS", "Frontend")
+    domain = ""
+    if job_title:
+        # Extract domain keywords
+        keywords = [
+            _DOMAIN_SEPARATOR_RE.sub('', domain_match.group(1).lower())
+            for domain_match in _DOMAIN_RE.finditer(job_title)
+        ]
+        if keywords:
+            domain = _DOMAIN_NAMES[min(keywords, key=_DOMAIN_PRIORITY.__getitem__)]
+        
+        # If no specific domain found, try to extract from job title structure
+        if not domain:
+            # Remove common level prefixes
+            title_clean = _LEVEL_PREFIX_RE.sub("", job_title).strip()
+            # Use the remaining as domain
+            if title_clean:
+                domain = title_clean
+    
+    hard_skills = skills_analysis.get("hard_skills", [])
+    soft_skills = skills_analysis.get("soft_skills", [])
+    keywords = skills_analysis.get("keywords", [])
+    required_tech = skills_analysis.get("required_technologies", [])
+    
+    # Validate current address
+    contact = resume_structure.get("contact", {})
+    address_valid, address_error = validate_address(contact)
+    
+    # Check education match
+    current_education = resume_structure.get("education", {})
+    current_degree = current_education.get("degree", "") if isinstance(current_education, dict) else ""
+    education_mismatch = False
+    education_note = ""
+    education_level = education_requirements.get("education_level") or "Not specified"
+    
+    if education_level != "Not specified":
+        required_level = education_level.lower()
+        # Compare whole words so e.g. "masterclass" does not count as a master's degree
+        required_tokens = set(_WORD_RE.findall(required_level))
+        current_tokens = set(_WORD_RE.findall(current_degree.lower()))
+        
+        # Check for mismatches
+        if "advanced degree" in required_level or not required_tokens.isdisjoint(_ADVANCED_DEGREE_WORDS):
+            if not current_tokens.isdisjoint(_BACHELOR_DEGREE_WORDS) and current_tokens.isdisjoint(_ADVANCED_DEGREE_WORDS):
+                education_mismatch = True
+                education_note = f"The job requires {education_level}, but the resume shows {current_degree}. If experience is strong, this should be addressed in the summary."
+    
+    # Create the tailoring prompt
+    education_mismatch_instruction = "None"
+    if education_mismatch:
+        education_mismatch_instruction = _EDUCATION_MISMATCH_INSTRUCTION.format(
+            required_education_level=education_level,
+            current_degree=current_degree
+        )
+    tailoring_prompt = _TAILORING_INSTRUCTIONS + _TAILORING_CONTEXT.format(
+        job_description=job_description,
+        # resume_structure is still an unmodified copy of the template here
+        resume_json=_template_prompt_json(template_path),
+        address_status="✓ Complete" if address_valid else f"✗ {address_error}",
+        current_location=contact.get('location', 'MISSING'),
+        required_education_level=education_level,
+        current_education=current_degree if current_degree else 'Not specified',
+        education_status="✓ Matches" if not education_mismatch else f"✗ MISMATCH - {education_note}",
+        hard_skills_count=len(hard_skills),
+        hard_skills_top20=_join_limited(hard_skills, 20),
+        soft_skills_count=len(soft_skills),
+        soft_skills_required=', '.join(soft_skills) if soft_skills else 'None specified',
+        keywords_count=len(keywords),
+        job_title=job_title,
+        headline=headline,
+        domain=domain,
+        education_mismatch_instruction=education_mismatch_instruction,
+        required_tech_all=', '.join(required_tech) if required_tech else 'All hard skills',
+        degree_type=education_requirements.get('degree_type', 'Any'),
+        location_instruction="Ensure location is complete (City, State/Province, Country format)" if not address_valid else "Keep location as-is",
+        summary_instruction="Add note about experience compensating for education if needed" if education_mismatch else "Standard tailoring"
+    )
+    
+    response = model.generate_content(tailoring_prompt, generation_config=_JSON_RESPONSE_CONFIG)
     
     try:
-        # Attempt to parse the response as JSON
-        # Extract JSON if it's wrapped in markdown code blocks
-        text = response.text
-        if '```json' in text and '```' in text.split('```json', 1)[1]:
-            json_str = text.split('```json', 1)[1].split('```', 1)[0].strip()
-        elif '```' in text and '```' in text.split('```', 1)[1]:
-            json_str = text.split('```', 1)[1].split('```', 1)[0].strip()
-        else:
-            json_str = text
-            
-        tailored_resume = json.loads(json_str)
+        # Attempt to parse the response as JSON, even if it's wrapped in markdown code blocks
+        tailored_resume = _merge_template_fields(resume_structure, _parse_json_response(response.text))
         
         # Always add headline if it was generated (ensures it's included even if AI didn't add it)
         if headline:
@@ -1053,24 +1426,13 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
                 
                 # If skills is a dict (categorized), add missing skills to appropriate categories
                 if isinstance(skills, dict):
-                    # Create a flat list of existing skills for checking
-                    existing_skills_flat = []
-                    for category, skill_list in skills.items():
-                        if isinstance(skill_list, list):
-                            existing_skills_flat.extend([s.lower() for s in skill_list])
-                    
-                    # Find missing skills
-                    missing_skills = []
-                    for skill in hard_skills:
-                        skill_lower = skill.lower()
-                        # Check if skill or variation exists
-                        found = False
-                        for existing in existing_skills_flat:
-                            if skill_lower in existing or existing in skill_lower:
-                                found = True
-                                break
-                        if not found:
-                            missing_skills.append(skill)
+                    # Find missing skills across all categories
+                    existing_skills = (
+                        skill
+                        for skill_list in skills.values() if isinstance(skill_list, list)
+                        for skill in skill_list
+                    )
+                    missing_skills = _find_missing_skills(hard_skills, existing_skills)
                     
                     # Add missing skills to appropriate category or create "Technologies" category
                     if missing_skills:
@@ -1085,120 +1447,138 @@ def tailor_resume(job_description, model, template = "resume_templates/michael.j
                 
                 # If skills is a list, add missing skills
                 elif isinstance(skills, list):
-                    existing_skills_lower = [s.lower() for s in skills]
-                    for skill in hard_skills:
-                        if skill.lower() not in existing_skills_lower:
-                            # Check for variations
-                            found_variation = False
-                            for existing in existing_skills_lower:
-                                if skill.lower() in existing or existing in skill.lower():
-                                    found_variation = True
-                                    break
-                            if not found_variation:
-                                skills.append(skill)
+                    skills.extend(_find_missing_skills(hard_skills, skills))
         
-        # Post-process to fix repetitive verbs, remove buzzwords, and add quantification
-        tailored_resume = fix_repetitive_verbs(tailored_resume)
-        tailored_resume = remove_buzzwords(tailored_resume)
-        tailored_resume = add_quantification_to_bullets(tailored_resume)
+        # Post-process to fix repetitive verbs and remove buzzwords
+        # (quantification is left to the AI prompt since numbers cannot be fabricated).
+        # Both edit the same texts in place, so their locations are collected once;
+        # verb fixing needs resume-wide counts and cannot be fused into a per-string pass
+        text_locations = _resume_text_locations(tailored_resume)
+        tailored_resume = fix_repetitive_verbs(tailored_resume, text_locations)
+        tailored_resume = remove_buzzwords(tailored_resume, text_locations)
         
         # Convert any markdown **bold** syntax to HTML <strong> tags
         tailored_resume = convert_markdown_bold_to_html(tailored_resume)
         
-        # Save the tailored resume to a file
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        json_file_path = output_dir / f"tailored_resume_{timestamp}.json"
+        _set_cached_extraction(cache_key, model, tailored_resume)
         
-        with open(json_file_path, "w") as f:
-            json.dump(tailored_resume, f, indent=2)
-            
-        return json_file_path, tailored_resume
+        return _save_tailored_resume(tailored_resume), tailored_resume
     
     except json.JSONDecodeError:
         # If JSON parsing fails, save the raw text
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
+        raw_file_path = _output_file_path("tailored_resume_raw", "txt")
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        raw_file_path = output_dir / f"tailored_resume_raw_{timestamp}.txt"
-        
-        with open(raw_file_path, "w") as f:
+        with open(raw_file_path, "w", encoding="utf-8") as f:
             f.write(response.text)
             
         raise Exception(f"Failed to parse tailored resume as JSON. Raw output saved to {raw_file_path}")
 
-def convert_json_to_text(tailored_resume_json):
+def _render_text_education_value(education, append):
+    """
+    Append a plain education value (e.g. a string) as a single line
+    """
+    append(education)
+
+def _render_text_education_entry(education, append):
+    """
+    Append the degree/university line, period and description of one education entry
+    """
+    get = education.get
+    append(f"{get('degree', '')} - {get('university', '')}")
+    if "period" in education:
+        append(education["period"])
+    if "description" in education:
+        append(education["description"])
+
+def _render_text_education_list(education, append):
+    """
+    Append each education entry in a list, rendering dict entries in full
+    """
+    for edu in education:
+        if type(edu) is dict:
+            _render_text_education_entry(edu, append)
+        else:
+            append(edu)
+
+# Text renderer for each JSON type the education section can hold; anything else is appended as-is
+_TEXT_EDUCATION_RENDERERS = {
+    dict: _render_text_education_entry,
+    list: _render_text_education_list,
+}
+
+def convert_json_to_text(tailored_resume_json, *, output_dir=None, timestamp=None):
     """
     Convert the tailored resume JSON to a formatted text
     This can be used for later PDF generation
+    Pass output_dir (an existing directory) and timestamp to share them across several outputs
     """
     # Convert the resume JSON to formatted text
     if isinstance(tailored_resume_json, str):
         # If path is provided, load the JSON
-        with open(tailored_resume_json, "r") as f:
-            tailored_resume = json.load(f)
+        tailored_resume = _load_json_file(tailored_resume_json)
     else:
         # If the JSON object is provided directly
         tailored_resume = tailored_resume_json
     
     # Convert to text format
     text_content = []
+    append = text_content.append
     
     # Add name and contact information
-    text_content.append(tailored_resume["name"])
+    append(tailored_resume["name"])
     
     # Add contact information as separate lines
     contact = tailored_resume["contact"]
-    for key, value in contact.items():
-        text_content.append(f"{key}: {value}")
+    text_content.extend(f"{key}: {value}" for key, value in contact.items())
     
     # Add separator
-    text_content.append("----")
+    append("----")
     
     # Add summary
-    text_content.append("SUMMARY")
-    text_content.append(tailored_resume["summary"])
-    text_content.append("")
+    append("SUMMARY")
+    append(tailored_resume["summary"])
+    append("")
     
     # Add references if they exist
     if "references" in tailored_resume and tailored_resume["references"]:
-        text_content.append("PROFESSIONAL REFERENCES")
+        append("PROFESSIONAL REFERENCES")
         for ref in tailored_resume["references"]:
-            text_content.append(f"{ref.get('name', '')} - Link: {ref.get('link', '')}")
-        text_content.append("")
+            get = ref.get
+            append(f"{get('name', '')} - Link: {get('link', '')}")
+        append("")
     
     # Add experience
-    text_content.append("EXPERIENCE")
+    append("EXPERIENCE")
     
     for exp in tailored_resume["experience"]:
+        get = exp.get
         # Title and company
-        title_company = f"{exp.get('title', '')} at {exp.get('company', '')}"
-        text_content.append(title_company)
+        append(f"{get('title', '')} at {get('company', '')}")
         
         # Period
-        if "period" in exp:
-            text_content.append(exp["period"])
+        period = get("period")
+        if period is not None:
+            append(period)
         
         # Skills used
-        if "skills" in exp and exp["skills"]:
-            if isinstance(exp["skills"], list):
-                text_content.append("Skills: " + ", ".join(exp["skills"]))
+        exp_skills = get("skills")
+        if exp_skills:
+            if isinstance(exp_skills, list):
+                append("Skills: " + ", ".join(exp_skills))
             else:
-                text_content.append(f"Skills: {exp['skills']}")
+                append(f"Skills: {exp_skills}")
         
         # Summary
-        if "summary" in exp:
-            text_content.append(exp["summary"])
+        summary = get("summary")
+        if summary is not None:
+            append(summary)
         
         # Highlights/bullet points
-        if "highlights" in exp and exp["highlights"]:
-            for highlight in exp["highlights"]:
-                text_content.append(f"• {highlight}")
+        highlights = get("highlights")
+        if highlights:
+            text_content.extend(f"• {highlight}" for highlight in highlights)
         
-        text_content.append("")
+        append("")
     
     # Add skills section - Removed per user request
     # text_content.append("SKILLS")
@@ -1218,71 +1598,58 @@ def convert_json_to_text(tailored_resume_json):
     # text_content.append("")
     
     # Add education
-    text_content.append("EDUCATION")
+    append("EDUCATION")
     
     education = tailored_resume["education"]
-    if isinstance(education, dict):
-        text_content.append(f"{education.get('degree', '')} - {education.get('university', '')}")
-        if "period" in education:
-            text_content.append(education["period"])
-        if "description" in education:
-            text_content.append(education["description"])
-    elif isinstance(education, list):
-        for edu in education:
-            if isinstance(edu, dict):
-                text_content.append(f"{edu.get('degree', '')} - {edu.get('university', '')}")
-                if "period" in edu:
-                    text_content.append(edu["period"])
-                if "description" in edu:
-                    text_content.append(edu["description"])
-            else:
-                text_content.append(edu)
-    else:
-        text_content.append(education)
+    _TEXT_EDUCATION_RENDERERS.get(type(education), _render_text_education_value)(education, append)
     
     # Combine all text
     full_text = "\n".join(text_content)
     
     # Save the text version
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
+    text_file_path = _output_file_path("tailored_resume_text", "txt", output_dir, timestamp)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    text_file_path = output_dir / f"tailored_resume_text_{timestamp}.txt"
-    
-    with open(text_file_path, "w") as f:
-        f.write(full_text)
+    text_file_path.write_bytes(full_text.encode("utf-8"))
     
     return text_file_path, full_text
 
-def convert_json_to_markdown(tailored_resume_json):
+# Inline HTML for the markdown top section: a LinkedIn link, a plain-text contact,
+# and the row holding the joined contacts on the left and the location on the right
+_CONTACT_LINK_HTML = '<a href="{url}" style="margin: 0 0.5em; color: #333333; text-decoration: none;">{text}</a>'
+_CONTACT_TEXT_HTML = '<span style="margin: 0 0.5em; color: #333333;">{text}</span>'
+_CONTACTS_ROW_HTML = '<div style="display: flex; flex-direction: row; justify-content: space-between; width:100%"><p >{contacts}</p><p>{location}</p></div>'
+
+# {{placeholder}} markers in the markdown output templates
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)\}\}')
+
+def _fill_template(template, values):
+    """
+    Replace every {{placeholder}} in template with its entry in values in one pass
+    Placeholders without an entry are left as they are
+    """
+    return _PLACEHOLDER_RE.sub(lambda match: values.get(match.group(1), match.group(0)), template)
+
+def convert_json_to_markdown(tailored_resume_json, *, output_dir=None, timestamp=None):
     """
     Convert the tailored resume JSON to a well-formatted markdown
     This is used for PDF generation with styling
     Uses the template files in the output_template directory
+    Pass output_dir (an existing directory) and timestamp to share them across several outputs
     """
     # Load the JSON if a path is provided
     if isinstance(tailored_resume_json, str):
-        with open(tailored_resume_json, "r") as f:
-            tailored_resume = json.load(f)
+        tailored_resume = _load_json_file(tailored_resume_json)
     else:
         tailored_resume = tailored_resume_json
     
     # Load the main template file
-    template_dir = os.path.join(os.path.dirname(__file__), "output_template")
-    template_path = os.path.join(os.path.dirname(__file__), "output_template.md")
     try:
-        with open(template_path, "r") as f:
-            template_content = f.read()
+        template_content = _read_template(_OUTPUT_TEMPLATE_PATH)
     except FileNotFoundError:
-        raise FileNotFoundError(f"Resume template markdown file not found at {template_path}")
+        raise FileNotFoundError(f"Resume template markdown file not found at {_OUTPUT_TEMPLATE_PATH}")
     
     # Load all section templates
-    def load_template(filename):
-        file_path = os.path.join(template_dir, filename)
-        with open(file_path, "r") as f:
-            return f.read()
-    
+    load_template = _load_output_template
     top_section_template = load_template("top_section.md")
     summary_section_template = load_template("summary_section.md")
     references_section_template = load_template("references_section.md")
@@ -1309,109 +1676,105 @@ def convert_json_to_markdown(tailored_resume_json):
                 location_text = value
         else:
             # Extract display text: for mailto: extract email, for tel: extract phone, otherwise use full URL
-            if value.startswith("mailto:"):
-                display_text = value.replace("mailto:", "")
-            elif value.startswith("tel:"):
-                display_text = value.replace("tel:", "")
-            else:
-                display_text = value
+            display_text = value.removeprefix("mailto:").removeprefix("tel:")
             
             # Only use href for LinkedIn links
             if key.lower() == "linkedin" or "linkedin.com" in value.lower():
                 # Ensure LinkedIn URL has proper protocol
                 linkedin_url = value
-                if not linkedin_url.startswith("http://") and not linkedin_url.startswith("https://"):
+                if not linkedin_url.startswith(("http://", "https://")):
                     if linkedin_url.startswith("www."):
                         linkedin_url = "https://" + linkedin_url
                     else:
                         linkedin_url = "https://www." + linkedin_url
-                contact_links.append(f'<a href="{linkedin_url}" style="margin: 0 0.5em; color: #333333; text-decoration: none;">{display_text}</a>')
+                contact_links.append(_CONTACT_LINK_HTML.format(url=linkedin_url, text=display_text))
             else:
                 # For other contacts (email, phone, etc.), display as plain text without href
-                contact_links.append(f'<span style="margin: 0 0.5em; color: #333333;">{display_text}</span>')
+                contact_links.append(_CONTACT_TEXT_HTML.format(text=display_text))
     
     # Combine contacts and location in a flex container
-    contacts_text = " • ".join(contact_links)
-    contacts_html = f'<div style="display: flex; flex-direction: row; justify-content: space-between; width:100%"><p >{contacts_text}</p><p>{location_text}</p></div>'
-    
-    top_section = top_section_template
-    top_section = top_section.replace("{{name}}", name)
+    contacts_html = _CONTACTS_ROW_HTML.format(contacts=" • ".join(contact_links), location=location_text)
     
     # Add headline if it exists
     headline = tailored_resume.get("headline", "")
     headline_section = ""
     if headline:
         headline_section = f'<div style="color: #666666; font-size: 1.1em; margin-bottom: 0.5em; font-weight: 500; text-align: left;">{headline}</div>'
-    top_section = top_section.replace("{{headline}}", headline_section)
-    top_section = top_section.replace("{{contacts}}", contacts_html)
+    top_section = _fill_template(top_section_template, {
+        "name": name,
+        "headline": headline_section,
+        "contacts": contacts_html
+    })
     
     # Generate Summary Section
     summary = tailored_resume["summary"]
     summary_section = summary_section_template.replace("{{summary}}", summary)
     
     # Generate Experiences Section
-    experiences = ""
+    experience_items = []
     for exp in tailored_resume["experience"]:
+        get = exp.get
         # Extract information
-        title = exp.get('title', '')
-        company = exp.get('company', '')
+        title = get('title', '')
+        company = get('company', '')
         
         # Parse location from company string if it's in parentheses
         location = ""
-        if "(" in company and ")" in company:
-            company_parts = company.split("(", 1)
-            company = company_parts[0].strip()
-            location = company_parts[1].replace(")", "").strip()
+        if ")" in company:
+            company_name, sep, company_location = company.partition("(")
+            if sep:
+                company = company_name.strip()
+                location = company_location.replace(")", "").strip()
         
         # Extract period and split into from/to
-        period = exp.get('period', '')
-        from_date = period
-        to_date = ""
-        if "-" in period:
-            date_parts = period.split("-", 1)
-            from_date = date_parts[0].strip()
-            to_date = date_parts[1].strip()
+        period = get('period', '')
+        from_date, sep, to_date = period.partition("-")
+        if sep:
+            from_date = from_date.strip()
+            to_date = to_date.strip()
         
         # Get summary and skills
-        description = exp.get('summary', '')
+        description = get('summary', '')
         skills_text = ""
-        if "skills" in exp and exp["skills"]:
-            if isinstance(exp["skills"], list):
-                skills_text = ", ".join(exp["skills"])
+        exp_skills = get('skills')
+        if exp_skills:
+            if isinstance(exp_skills, list):
+                skills_text = ", ".join(exp_skills)
             else:
-                skills_text = str(exp["skills"])
+                skills_text = str(exp_skills)
         
         # Generate highlights section if needed
         highlights_html = ""
-        highlights = exp.get('highlights', [])
+        highlights = get('highlights', [])
         if highlights and any(h.strip() for h in highlights):
-            highlight_items = ""
-            for highlight in highlights:
-                if highlight and highlight.strip():
-                    highlight_item = experience_highlight_item_template.replace("{{highlight}}", highlight)
-                    highlight_items += highlight_item
+            highlight_items = [
+                experience_highlight_item_template.replace("{{highlight}}", highlight)
+                for highlight in highlights
+                if highlight and highlight.strip()
+            ]
             
-            highlights_html = experience_highlights_template.replace("{{highlights}}", highlight_items)
+            highlights_html = experience_highlights_template.replace("{{highlights}}", "".join(highlight_items))
         
         # Create experience item by replacing placeholders
-        experience_item = experience_item_template
-        experience_item = experience_item.replace("{{position}}", title)
-        experience_item = experience_item.replace("{{company_name}}", company)
-        experience_item = experience_item.replace("{{location}}", location)
-        experience_item = experience_item.replace("{{from}}", from_date)
-        experience_item = experience_item.replace("{{to}}", to_date)
-        experience_item = experience_item.replace("{{description}}", description)
-        experience_item = experience_item.replace("{{skills}}", skills_text)
-        experience_item = experience_item.replace("{{highlights}}", highlights_html)
+        experience_item = _fill_template(experience_item_template, {
+            "position": title,
+            "company_name": company,
+            "location": location,
+            "from": from_date,
+            "to": to_date,
+            "description": description,
+            "skills": skills_text,
+            "highlights": highlights_html
+        })
         
-        experiences += experience_item + "\n"
+        experience_items.append(experience_item + "\n")
     
     # Combine experiences into the experiences section
-    experiences_section = experiences_section_template.replace("{{experiences}}", experiences)
+    experiences_section = experiences_section_template.replace("{{experiences}}", "".join(experience_items))
     
     # Generate Skills Section
     skills = tailored_resume["skills"]
-    skills_html = ""
+    skill_items = []
     if isinstance(skills, dict):
         for category, skill_list in skills.items():
             if isinstance(skill_list, list):
@@ -1419,62 +1782,62 @@ def convert_json_to_markdown(tailored_resume_json):
             else:
                 skills_text = str(skill_list)
             
-            skill_item = skill_section_item_template
-            skill_item = skill_item.replace("{{category}}", category)
-            skill_item = skill_item.replace("{{skills}}", skills_text)
-            skills_html += skill_item + "\n"
+            skill_item = _fill_template(skill_section_item_template, {"category": category, "skills": skills_text})
+            skill_items.append(skill_item + "\n")
     
-    skills_section = skills_section_template.replace("{{skills}}", skills_html)
+    skills_section = skills_section_template.replace("{{skills}}", "".join(skill_items))
     
     # Generate Education Section (now tailored based on job description)
     education_section = education_section_template
     if isinstance(tailored_resume["education"], dict):
         education = tailored_resume["education"]
-        degree = education.get("degree", "")
-        university = education.get("university", "")
-        period = education.get("period", "")
+        get = education.get
+        degree = get("degree", "")
+        university = get("university", "")
+        period = get("period", "")
         # Description should be tailored by AI based on job description
-        description = education.get("description", "")
+        description = get("description", "")
         
         # If no description was created by AI, create a basic one (but ideally AI should have created it based on job description)
         if not description or description.strip() == "":
             description = f"Relevant coursework and projects in software development and computer science."
         
         # Replace education information with actual values from tailored resume
-        education_section = education_section.replace("{{degree}}", degree if degree else "")
-        education_section = education_section.replace("{{university}}", university if university else "")
-        education_section = education_section.replace("{{period}}", period if period else "")
-        education_section = education_section.replace("{{description}}", description if description else "")
+        education_section = _fill_template(education_section, {
+            "degree": degree if degree else "",
+            "university": university if university else "",
+            "period": period if period else "",
+            "description": description if description else ""
+        })
     
     # Generate References Section (only if references exist and not empty)
     references_section = ""
     if "references" in tailored_resume and tailored_resume["references"]:
-        references_html = ""
+        reference_items = []
         for ref in tailored_resume["references"]:
-            ref_item = reference_item_template
-            ref_item = ref_item.replace("{{name}}", ref.get("name", ""))
-            ref_item = ref_item.replace("{{text}}", ref.get("text", ""))
-            ref_item = ref_item.replace("{{link}}", ref.get("link", "#"))
-            references_html += ref_item
+            get = ref.get
+            ref_item = _fill_template(reference_item_template, {
+                "name": get("name", ""),
+                "text": get("text", ""),
+                "link": get("link", "#")
+            })
+            reference_items.append(ref_item)
         
-        references_section = references_section_template.replace("{{references}}", references_html)
+        references_section = references_section_template.replace("{{references}}", "".join(reference_items))
     
     # Combine all sections into the main template
-    template_content = template_content.replace("{{top_section}}", top_section)
-    template_content = template_content.replace("{{summary_section}}", summary_section)
-    template_content = template_content.replace("{{references_section}}", references_section)
-    template_content = template_content.replace("{{experiences_section}}", experiences_section)
-    template_content = template_content.replace("{{skills_section}}", skills_section)
-    template_content = template_content.replace("{{education_section}}", education_section)
+    template_content = _fill_template(template_content, {
+        "top_section": top_section,
+        "summary_section": summary_section,
+        "references_section": references_section,
+        "experiences_section": experiences_section,
+        "skills_section": skills_section,
+        "education_section": education_section
+    })
     
     # Save the markdown version
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    markdown_file_path = output_dir / f"tailored_resume_markdown_{timestamp}.md"
+    markdown_file_path = _output_file_path("tailored_resume_markdown", "md", output_dir, timestamp)
     
-    with open(markdown_file_path, "w") as f:
-        f.write(template_content)
+    markdown_file_path.write_bytes(template_content.encode("utf-8"))
     
     return template_content
\ No newline at end of file